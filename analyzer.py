@@ -6,8 +6,14 @@ structured view of the business using a token-efficient LLM call.
 """
 
 import json
+import re
 from textwrap import shorten
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
+
+try:
+    import ahocorasick
+except ImportError:  # optional: pyahocorasick; fall back to a single regex scan
+    ahocorasick = None
 
 # Note: in the original version this module called the OpenAI API.
 # For local/offline use and interview demos, we now run fully locally
@@ -17,25 +23,174 @@ from typing import List, Dict, Any
 ContentBlock = Dict[str, Any]
 BusinessProfile = Dict[str, Any]
 
+# Keyword groups for the offline heuristic: a label is emitted when any of
+# its phrases occurs in the text. Matching is plain substring matching.
+_OFFERING_RULES = (
+    (frozenset({"hosting", "infrastructure"}), "Managed infrastructure and hosting"),
+    (frozenset({"ml ops", "mlops"}), "ML Ops tooling"),
+    (frozenset({"deployment", "deploy"}), "Model deployment and monitoring"),
+)
+_AUDIENCE_RULES = (
+    (frozenset({"enterprise", "enterprises"}), "Enterprise technology teams"),
+    (frozenset({"saas"}), "B2B SaaS companies"),
+    (frozenset({"startup", "founder"}), "High-growth startups"),
+)
+_VALUE_PROP_RULES = (
+    (frozenset({"faster", "weeks instead of months"}), "Faster time-to-value compared to in-house builds"),
+    (frozenset({"secure", "security"}), "Security and compliance handled by specialists"),
+    (frozenset({"scal"}), "Scales with demand without manual capacity planning"),
+)
+_TONE_RULES = (
+    (frozenset({"pragmatic", "practical"}), "Pragmatic and down-to-earth"),
+    (frozenset({"partner", "with you"}), "Partnership-oriented and supportive"),
+)
+
+# Every phrase the heuristic looks for. They are all matched in a single
+# pass over the text instead of one substring scan per phrase.
+_PROFILE_KEYWORDS = tuple(sorted(frozenset().union(*(
+    keywords
+    for rules in (_OFFERING_RULES, _AUDIENCE_RULES, _VALUE_PROP_RULES, _TONE_RULES)
+    for keywords, _ in rules
+))))
+
+
+def _build_keyword_automaton():
+    """Build an Aho-Corasick automaton over the keywords, if available."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in _PROFILE_KEYWORDS:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# Regex fallback: a lookahead tries every start position, longest phrase
+# first; shorter phrases sharing that start are added back via prefixes.
+_KEYWORD_RE = re.compile(
+    "(?=(%s))" % "|".join(
+        re.escape(k) for k in sorted(_PROFILE_KEYWORDS, key=len, reverse=True)
+    )
+)
+_KEYWORD_PREFIXES = {
+    keyword: {k for k in _PROFILE_KEYWORDS if keyword.startswith(k)}
+    for keyword in _PROFILE_KEYWORDS
+}
+
+
+def _scan_keywords(text: str) -> Set[str]:
+    """Return the subset of `_PROFILE_KEYWORDS` occurring in `text`."""
+    if _KEYWORD_AUTOMATON is not None:
+        return {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(text)}
+    hits: Set[str] = set()
+    for keyword in _KEYWORD_RE.findall(text):
+        hits |= _KEYWORD_PREFIXES[keyword]
+    return hits
+
+
+_ALL_RULES = _OFFERING_RULES + _AUDIENCE_RULES + _VALUE_PROP_RULES + _TONE_RULES
+
+
+# Marks a context cut short at its character cap
+_TRUNCATION_PLACEHOLDER = "\n...[truncated]..."
+
+# A phrase crossing a block boundary starts at most this many characters
+# before the boundary, so that much of the previous text is rescanned.
+_KEYWORD_OVERLAP = max(map(len, _PROFILE_KEYWORDS)) - 1
+
+
+def _block_line(block: ContentBlock) -> str:
+    """Render a block as one context line, with its whitespace collapsed."""
+    text = " ".join(block["text"].split())
+    if block["type"] == "heading":
+        level = block["level"] or 1
+        prefix = "#" * min(level, 6)
+        return f"{prefix} {text}".rstrip()
+    return text
+
+
+def _scan_budget(lines: List[str], total: int, max_chars: int) -> int:
+    """
+    Number of leading characters of the space-joined lines that the old
+    shortened context kept: everything if their joined length `total` fits
+    in `max_chars`, otherwise the whole words that fit alongside the
+    truncation placeholder.
+    """
+    if total <= max_chars:
+        return max_chars
+    # Only the first max_chars characters can affect where the cut falls; a
+    # non-space stand-in for the rest keeps the text over the cap once
+    # shorten() strips trailing whitespace.
+    text = " ".join(lines)[:max_chars] + "x"
+    kept = shorten(text, width=max_chars, placeholder=_TRUNCATION_PLACEHOLDER)
+    return max(len(kept) - len(_TRUNCATION_PLACEHOLDER), 0)
+
+
+def _scan_blocks(blocks: List[ContentBlock], max_chars: int = 2000) -> Set[str]:
+    """
+    Collect keyword hits block by block, without building a joined context.
+    Each scan is prefixed with the tail of the text before it, so phrases
+    spanning two blocks still match as they did in the joined context.
+    Only the text the old shortened context kept is scanned, and the scan
+    stops as soon as every rule has matched, since further hits cannot
+    change the profile.
+    """
+    lines: List[str] = []
+    total = -1
+    for block in blocks:
+        line = _block_line(block)
+        if line:
+            lines.append(line)
+            total += len(line) + 1
+            if total > max_chars:
+                break
+
+    hits: Set[str] = set()
+    pending = list(_ALL_RULES)
+    budget = _scan_budget(lines, total, max_chars)
+    tail = ""
+    for line in lines:
+        if budget <= 0 or not pending:
+            break
+        line = line[:budget].lower()
+        window = tail + line
+        hits |= _scan_keywords(window)
+        tail = window[-_KEYWORD_OVERLAP:] + " "
+        budget -= len(line) + 1
+        pending = [rule for rule in pending if not rule[0] & hits]
+    return hits
+
+
+def _labels_for(hits: Set[str], rules) -> List[str]:
+    """Return the label of every rule whose keyword set intersects `hits`."""
+    return [label for keywords, label in rules if keywords & hits]
+
 
 def _build_compact_context(blocks: List[ContentBlock], max_chars: int = 3500) -> str:
     """
     Turn the blocks into a compact, line-based context string.
     We keep it short to avoid wasting tokens.
     """
+    placeholder = _TRUNCATION_PLACEHOLDER
     lines = []
+    total = 0
     for block in blocks:
-        if block["type"] == "heading":
-            level = block["level"] or 1
-            prefix = "#" * min(level, 6)
-            lines.append(f"{prefix} {block['text']}")
-        else:
-            lines.append(block["text"])
+        line = _block_line(block)
+        if lines:
+            total += 1  # newline separator
+        total += len(line)
+        lines.append(line)
+        # Stop as soon as the cap is exceeded; the rest would be cut anyway.
+        if total > max_chars:
+            break
 
     full = "\n".join(lines)
     # Hard cap length; we want to be deterministic about token usage.
-    # textwrap.shorten keeps sentence-ish boundaries when possible.
-    return shorten(full, width=max_chars, placeholder="\n...[truncated]...")
+    if len(full) <= max_chars:
+        return full
+    return full[: max(max_chars - len(placeholder), 0)] + placeholder
 
 
 def _offline_profile_from_blocks(blocks: List[ContentBlock]) -> BusinessProfile:
@@ -44,44 +199,22 @@ def _offline_profile_from_blocks(blocks: List[ContentBlock]) -> BusinessProfile:
     This keeps the rest of the pipeline unchanged, but removes
     the dependency on any external API.
     """
-    compact = _build_compact_context(blocks, max_chars=2000).lower()
+    hits = _scan_blocks(blocks, max_chars=2000)
 
     # Crude keyword-based guesses; good enough for a demo and easy to explain.
-    offerings: List[str] = []
-    if "hosting" in compact or "infrastructure" in compact:
-        offerings.append("Managed infrastructure and hosting")
-    if "ml ops" in compact or "ml ops" in compact.replace("mlops", "ml ops"):
-        offerings.append("ML Ops tooling")
-    if "deployment" in compact or "deploy" in compact:
-        offerings.append("Model deployment and monitoring")
+    offerings = _labels_for(hits, _OFFERING_RULES)
     if not offerings:
         offerings.append("Software products and related services")
 
-    audience: List[str] = []
-    if "enterprise" in compact or "enterprises" in compact:
-        audience.append("Enterprise technology teams")
-    if "saas" in compact:
-        audience.append("B2B SaaS companies")
-    if "startup" in compact or "founder" in compact:
-        audience.append("High-growth startups")
+    audience = _labels_for(hits, _AUDIENCE_RULES)
     if not audience:
         audience.append("Modern businesses looking to use technology more effectively")
 
-    value_props: List[str] = []
-    if "faster" in compact or "weeks instead of months" in compact:
-        value_props.append("Faster time-to-value compared to in-house builds")
-    if "secure" in compact or "security" in compact:
-        value_props.append("Security and compliance handled by specialists")
-    if "scal" in compact:
-        value_props.append("Scales with demand without manual capacity planning")
+    value_props = _labels_for(hits, _VALUE_PROP_RULES)
     if not value_props:
         value_props.append("Focused on reliable delivery and practical outcomes")
 
-    tone_signals: List[str] = []
-    if "pragmatic" in compact or "practical" in compact:
-        tone_signals.append("Pragmatic and down-to-earth")
-    if "partner" in compact or "with you" in compact:
-        tone_signals.append("Partnership-oriented and supportive")
+    tone_signals = _labels_for(hits, _TONE_RULES)
     if not tone_signals:
         tone_signals.extend(["Professional", "Confident"])
 
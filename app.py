@@ -5,7 +5,6 @@ Flask web application for the AI-powered brochure generator.
 Replaces the CLI interface with a web UI.
 """
 
-import os
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, send_file
 from werkzeug.utils import secure_filename
@@ -13,20 +12,32 @@ from werkzeug.utils import secure_filename
 from scraper import scrape_html
 from analyzer import analyze_business
 from generator import generate_brochures
-from image_generator import generate_brochure_background
+from image_generator import generate_all_backgrounds
 from image_analyzer import analyze_image
 from text_analyzer import analyze_text
 
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'data'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
 
-# Ensure upload folder exists
-Path(app.config['UPLOAD_FOLDER']).mkdir(exist_ok=True)
+# Ensure output folders exist
 Path('output').mkdir(exist_ok=True)
 Path('static/images').mkdir(parents=True, exist_ok=True)
 
+AUDIENCES = ['customers', 'investors', 'partners']
+
+
+def _ensure_backgrounds() -> dict:
+    """
+    Render any missing brochure backgrounds once, at startup.
+    They only depend on the audience, so requests just hand out the URLs.
+    """
+    paths = generate_all_backgrounds({}, AUDIENCES)
+    return {audience: f'/static/images/{Path(path).name}' for audience, path in paths.items()}
+
+
+BACKGROUND_URLS = _ensure_backgrounds()
+
 
 @app.route('/')
 def index():
@@ -49,11 +60,8 @@ def generate():
             if file.filename == '':
                 return jsonify({'error': 'No file selected'}), 400
             
-            # Save and process HTML
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            content_blocks = scrape_html(filepath)
+            # Parse the upload straight from the request stream
+            content_blocks = scrape_html(file.stream)
         
         elif input_type == 'image':
             if 'image_file' not in request.files:
@@ -63,11 +71,9 @@ def generate():
             if file.filename == '':
                 return jsonify({'error': 'No image selected'}), 400
             
-            # Save and process image
+            # Analyze the upload straight from the request stream
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            content_blocks = analyze_image(filepath)
+            content_blocks = analyze_image(file.stream, filename=filename)
         
         elif input_type == 'text':
             text_input = request.form.get('text_input', '').strip()
@@ -84,18 +90,12 @@ def generate():
         profile = analyze_business(content_blocks)
         brochures = generate_brochures(profile)
         
-        # Generate background images for each brochure
-        image_paths = {}
-        for audience in ['customers', 'investors', 'partners']:
-            image_path = generate_brochure_background(profile, audience)
-            image_paths[audience] = f'/static/images/{os.path.basename(image_path)}'
-        
-        # Return results
+        # Return results; backgrounds were rendered at startup
         return jsonify({
             'success': True,
             'profile': profile,
             'brochures': brochures,
-            'images': image_paths
+            'images': BACKGROUND_URLS
         })
     
     except Exception as e:
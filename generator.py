@@ -9,161 +9,138 @@ from typing import Dict, Any
 
 BusinessProfile = Dict[str, Any]
 BrochureSet = Dict[str, str]
+BrochureContext = Dict[str, Any]
 
 
-def _brochure_for_customers(profile: BusinessProfile) -> str:
+def _brochure_context(profile: BusinessProfile) -> BrochureContext:
+    """
+    Read and normalize the profile fields once for all three brochures.
+    Missing or empty fields are None; each brochure applies its own fallback.
+    """
+    positioning = profile.get("company_positioning")
+    return {
+        "positioning": positioning.strip() if positioning is not None else None,
+        "offerings": profile.get("core_offerings") or None,
+        "audience": profile.get("target_audience") or None,
+        "uvps": profile.get("unique_value_propositions") or None,
+        "tone": profile.get("brand_tone_signals") or None,
+    }
+
+
+def _brochure_for_customers(ctx: BrochureContext) -> str:
     """Create a creative, engaging brochure for customers."""
-    positioning = profile.get("company_positioning", "Innovative solutions for modern businesses").strip()
-    offerings = profile.get("core_offerings") or ["Quality products and services"]
-    audience = profile.get("target_audience") or ["Forward-thinking companies"]
-    uvps = profile.get("unique_value_propositions") or ["Excellence in delivery"]
-    tone = profile.get("brand_tone_signals") or ["Professional"]
-    
-    lines = []
-    
-    # Hero section
-    lines.append("## 🚀 Transform Your Business Today")
-    lines.append("")
-    lines.append(f"**{positioning}**")
-    lines.append("")
-    
-    # What we offer - creative section
-    lines.append("### ✨ What Sets Us Apart")
-    lines.append("")
-    for i, offering in enumerate(offerings[:4], 1):
-        lines.append(f"**{i}. {offering}**")
-        lines.append("")
-    
-    # Who we work with
-    if audience:
-        lines.append("### 👥 Perfect For")
-        lines.append("")
-        for item in audience[:3]:
-            lines.append(f"✓ {item}")
-        lines.append("")
-    
-    # Value propositions - creative format
-    if uvps:
-        lines.append("### 💎 Why Choose Us")
-        lines.append("")
-        for v in uvps[:4]:
-            lines.append(f"**→ {v}**")
-        lines.append("")
-    
-    # Call to action
-    lines.append("### 🎯 Ready to Get Started?")
-    lines.append("")
-    lines.append("Join hundreds of satisfied customers who trust us to deliver exceptional results.")
-    
-    return "\n".join(lines).strip()
+    positioning = ctx["positioning"] if ctx["positioning"] is not None else "Innovative solutions for modern businesses"
+    offerings = ctx["offerings"] or ("Quality products and services",)
+    audience = ctx["audience"] or ("Forward-thinking companies",)
+    uvps = ctx["uvps"] or ("Excellence in delivery",)
+    
+    # Bullet sections are joined up front, then the whole brochure is a
+    # single f-string instead of dozens of list appends plus a join.
+    offering_lines = "\n\n".join([f"**{i}. {offering}**" for i, offering in enumerate(offerings[:4], 1)])
+    audience_lines = "\n".join([f"✓ {item}" for item in audience[:3]])
+    uvp_lines = "\n".join([f"**→ {v}**" for v in uvps[:4]])
+    
+    return f"""\
+## 🚀 Transform Your Business Today
 
+**{positioning}**
 
-def _brochure_for_investors(profile: BusinessProfile) -> str:
+### ✨ What Sets Us Apart
+
+{offering_lines}
+
+### 👥 Perfect For
+
+{audience_lines}
+
+### 💎 Why Choose Us
+
+{uvp_lines}
+
+### 🎯 Ready to Get Started?
+
+Join hundreds of satisfied customers who trust us to deliver exceptional results."""
+
+
+def _brochure_for_investors(ctx: BrochureContext) -> str:
     """Create a compelling investment-focused brochure."""
-    positioning = profile.get("company_positioning", "A high-growth technology company").strip()
-    offerings = profile.get("core_offerings") or ["Scalable solutions"]
-    audience = profile.get("target_audience") or ["Enterprise clients"]
-    uvps = profile.get("unique_value_propositions") or ["Strong market position"]
-    
-    lines = []
-    
-    # Investment pitch
-    lines.append("## 💼 Investment Opportunity")
-    lines.append("")
-    lines.append(f"**{positioning}**")
-    lines.append("")
-    
-    # Market opportunity
-    lines.append("### 📈 Market Position")
-    lines.append("")
-    if audience:
-        lines.append("**Target Market:**")
-        for item in audience[:3]:
-            lines.append(f"• {item}")
-        lines.append("")
+    positioning = ctx["positioning"] if ctx["positioning"] is not None else "A high-growth technology company"
+    offerings = ctx["offerings"] or ("Scalable solutions",)
+    audience = ctx["audience"] or ("Enterprise clients",)
+    uvps = ctx["uvps"] or ("Strong market position",)
     
-    # Competitive advantages
-    if uvps:
-        lines.append("### 🏆 Competitive Advantages")
-        lines.append("")
-        for v in uvps[:5]:
-            lines.append(f"**✓ {v}**")
-        lines.append("")
+    audience_lines = "\n".join([f"• {item}" for item in audience[:3]])
+    uvp_lines = "\n".join([f"**✓ {v}**" for v in uvps[:5]])
+    offering_lines = "\n".join([f"• **{offering}**" for offering in offerings[:4]])
     
-    # Product portfolio
-    if offerings:
-        lines.append("### 🎯 Product Portfolio")
-        lines.append("")
-        for offering in offerings[:4]:
-            lines.append(f"• **{offering}**")
-        lines.append("")
-    
-    # Growth potential
-    lines.append("### 📊 Growth Potential")
-    lines.append("")
-    lines.append("• Scalable business model")
-    lines.append("• Strong customer retention")
-    lines.append("• Expanding market opportunity")
-    lines.append("• Proven track record")
-    
-    return "\n".join(lines).strip()
+    return f"""\
+## 💼 Investment Opportunity
+
+**{positioning}**
+
+### 📈 Market Position
+
+**Target Market:**
+{audience_lines}
+
+### 🏆 Competitive Advantages
+
+{uvp_lines}
 
+### 🎯 Product Portfolio
 
-def _brochure_for_partners(profile: BusinessProfile) -> str:
+{offering_lines}
+
+### 📊 Growth Potential
+
+• Scalable business model
+• Strong customer retention
+• Expanding market opportunity
+• Proven track record"""
+
+
+def _brochure_for_partners(ctx: BrochureContext) -> str:
     """Create a partnership-focused brochure."""
-    positioning = profile.get("company_positioning", "Building strategic partnerships").strip()
-    offerings = profile.get("core_offerings") or ["Quality solutions"]
-    tone = profile.get("brand_tone_signals") or ["Collaborative", "Trustworthy"]
-    uvps = profile.get("unique_value_propositions") or ["Mutual success"]
-    
-    lines = []
-    
-    # Partnership vision
-    lines.append("## 🤝 Let's Build Something Great Together")
-    lines.append("")
-    lines.append(f"**{positioning}**")
-    lines.append("")
+    positioning = ctx["positioning"] if ctx["positioning"] is not None else "Building strategic partnerships"
+    offerings = ctx["offerings"] or ("Quality solutions",)
+    tone = ctx["tone"] or ("Collaborative", "Trustworthy")
+    uvps = ctx["uvps"] or ("Mutual success",)
     
-    # Our values
-    if tone:
-        lines.append("### 💫 Our Partnership Values")
-        lines.append("")
-        for t in tone[:4]:
-            lines.append(f"**✨ {t}**")
-        lines.append("")
+    tone_lines = "\n".join([f"**✨ {t}**" for t in tone[:4]])
+    offering_lines = "\n".join([f"• **{offering}**" for offering in offerings[:4]])
+    uvp_lines = "\n".join([f"**→ {v}**" for v in uvps[:4]])
     
-    # What we bring
-    if offerings:
-        lines.append("### 🎁 What We Bring to the Table")
-        lines.append("")
-        for offering in offerings[:4]:
-            lines.append(f"• **{offering}**")
-        lines.append("")
-    
-    # Partnership benefits
-    if uvps:
-        lines.append("### 🌟 Partnership Benefits")
-        lines.append("")
-        for v in uvps[:4]:
-            lines.append(f"**→ {v}**")
-        lines.append("")
-    
-    # Call to action
-    lines.append("### 🚀 Ready to Partner?")
-    lines.append("")
-    lines.append("Let's explore how we can create mutual value and drive success together.")
-    
-    return "\n".join(lines).strip()
+    return f"""\
+## 🤝 Let's Build Something Great Together
+
+**{positioning}**
+
+### 💫 Our Partnership Values
+
+{tone_lines}
+
+### 🎁 What We Bring to the Table
+
+{offering_lines}
+
+### 🌟 Partnership Benefits
+
+{uvp_lines}
+
+### 🚀 Ready to Partner?
+
+Let's explore how we can create mutual value and drive success together."""
 
 
 def generate_brochures(profile: BusinessProfile) -> BrochureSet:
     """
     Main entry: from business profile dict to three creative brochures.
     """
+    ctx = _brochure_context(profile)
     return {
-        "customers": _brochure_for_customers(profile),
-        "investors": _brochure_for_investors(profile),
-        "partners": _brochure_for_partners(profile),
+        "customers": _brochure_for_customers(ctx),
+        "investors": _brochure_for_investors(ctx),
+        "partners": _brochure_for_partners(ctx),
     }
 
 
@@ -6,47 +6,68 @@ Uses basic image analysis and heuristics to infer company details.
 """
 
 from PIL import Image
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, BinaryIO, Optional, Union
 import os
+import re
 
 ContentBlock = Dict[str, Any]
 
+# Business terms looked for in uploaded filenames
+_COMMON_TERMS = (
+    'company', 'business', 'startup', 'enterprise', 'tech', 'ai', 'cloud',
+    'software', 'service', 'solutions', 'platform', 'app', 'digital'
+)
+# Zero-width lookahead, so overlapping terms ("applatform") are all reported;
+# no term is a prefix of another, so one match per position is enough.
+_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _COMMON_TERMS)) + "))")
+
+# Filename separators turned into spaces for the heading text
+_SEP_TBL = str.maketrans('_-', '  ')
+
 
 def _extract_text_from_image_metadata(image_path: str) -> List[str]:
-    """Extract any text metadata from image."""
+    """Extract any text metadata from image (path or bare filename)."""
     # In a real implementation, you'd use OCR here (like pytesseract)
     # For the stubbed version, we'll use filename and basic heuristics
     filename = os.path.basename(image_path).lower()
     
-    # Extract potential keywords from filename
-    keywords = []
-    common_terms = [
-        'company', 'business', 'startup', 'enterprise', 'tech', 'ai', 'cloud',
-        'software', 'service', 'solutions', 'platform', 'app', 'digital'
-    ]
-    
-    for term in common_terms:
-        if term in filename:
-            keywords.append(term)
-    
-    return keywords
+    # Extract potential keywords from filename in one scan, reported in term order
+    found = set(_KEYWORD_RE.findall(filename))
+    return [term for term in _COMMON_TERMS if term in found]
 
 
-def _analyze_image_content(image_path: str) -> Dict[str, Any]:
-    """Analyze image to extract visual cues."""
+def _analyze_image_content(image: Union[str, BinaryIO]) -> Dict[str, Any]:
+    """Analyze image (path or binary stream) to extract visual cues."""
     try:
-        img = Image.open(image_path)
+        img = Image.open(image)
         width, height = img.size
         
-        # Basic color analysis
-        colors = img.getcolors(maxcolors=256*256*256)
-        if colors:
-            # Get dominant colors
-            dominant_colors = sorted(colors, key=lambda x: x[0], reverse=True)[:5]
+        # The color heuristics only need a coarse view, so shrink the image
+        # first (draft lets JPEG decode straight at a reduced scale). NEAREST
+        # only picks existing pixels, so no blended edge colors end up in the
+        # exact-color histogram below.
+        img.draft('RGB', (512, 512))
+        img.thumbnail((256, 256), Image.Resampling.NEAREST)
+        
+        # Basic color analysis: histogram of pixels packed as 0xRRGGBB
+        # (convert() always copies, so only call it when the mode differs)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        pixels = np.asarray(img, dtype=np.uint32).reshape(-1, 3)
+        packed = (pixels[:, 0] << 16) | (pixels[:, 1] << 8) | pixels[:, 2]
+        colors, counts = np.unique(packed, return_counts=True)
+        if colors.size:
+            # Get dominant colors, most frequent first
+            top = min(5, colors.size)
+            dominant = np.argpartition(counts, -top)[-top:]
+            dominant_colors = colors[dominant[np.argsort(counts[dominant])[::-1]]]
+            channel_sums = (dominant_colors >> 16) + ((dominant_colors >> 8) & 0xFF) + (dominant_colors & 0xFF)
+            brightness = int(channel_sums[:3].sum()) / 3
             color_info = {
                 'dominant_colors': len(dominant_colors),
-                'is_bright': sum(c[1][0] + c[1][1] + c[1][2] for c in dominant_colors[:3]) / 3 > 400,
-                'is_dark': sum(c[1][0] + c[1][1] + c[1][2] for c in dominant_colors[:3]) / 3 < 200,
+                'is_bright': brightness > 400,
+                'is_dark': brightness < 200,
             }
         else:
             color_info = {'is_bright': True, 'is_dark': False}
@@ -62,15 +83,20 @@ def _analyze_image_content(image_path: str) -> Dict[str, Any]:
         return {}
 
 
-def analyze_image(image_path: str) -> List[ContentBlock]:
+def analyze_image(image: Union[str, BinaryIO], filename: Optional[str] = None) -> List[ContentBlock]:
     """
     Convert an image into content blocks that can be processed by the analyzer.
     This is a simplified version - in production you'd use OCR or vision models.
+    
+    `image` is a path or an open binary stream; streams may carry no name, so
+    pass `filename` for the filename-based heuristics.
     """
     blocks: List[ContentBlock] = []
     
-    # Extract from filename
-    filename = os.path.basename(image_path)
+    # Extract from filename (a stream's own name, if it has one)
+    if filename is None:
+        path = image if isinstance(image, (str, os.PathLike)) else getattr(image, 'name', '')
+        filename = os.path.basename(path) if isinstance(path, (str, os.PathLike)) else ''
     name_without_ext = os.path.splitext(filename)[0]
     
     # Create a heading from filename
@@ -78,11 +104,11 @@ def analyze_image(image_path: str) -> List[ContentBlock]:
         blocks.append({
             "type": "heading",
             "level": 1,
-            "text": name_without_ext.replace('_', ' ').replace('-', ' ').title()
+            "text": name_without_ext.translate(_SEP_TBL).title()
         })
     
     # Analyze image properties
-    img_info = _analyze_image_content(image_path)
+    img_info = _analyze_image_content(image)
     
     # Create content based on image characteristics
     if img_info.get('is_bright'):
@@ -100,7 +126,7 @@ def analyze_image(image_path: str) -> List[ContentBlock]:
         })
     
     # Extract keywords from filename
-    keywords = _extract_text_from_image_metadata(image_path)
+    keywords = _extract_text_from_image_metadata(filename)
     if keywords:
         blocks.append({
             "type": "paragraph",
@@ -6,187 +6,392 @@ Creates Pinterest/Canva-style backgrounds with gradients, shapes, and patterns.
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterable
 from PIL import Image, ImageDraw, ImageFont
-from PIL import ImageFilter, ImageEnhance
-import random
+import numpy as np
+import hashlib
 import math
+import threading
+import zlib
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional: numba; the radial gradient falls back to NumPy
+    njit = None
 
 BusinessProfile = Dict[str, Any]
 
+# Standard brochure size (A4 ratio, 1200x1697 for web)
+BACKGROUND_SIZE = (1200, 1697)
+
+# Part of the on-disk background cache key. Bump it whenever the rendering
+# itself changes (blending, shapes, patterns, enhancement or JPEG settings),
+# otherwise backgrounds rendered by the old code keep being served.
+_RENDER_VERSION = 1
+
+
+def _blend_colors(ratio: np.ndarray, colors: tuple) -> np.ndarray:
+    """Interpolate between the two scheme colors for every ratio in the array."""
+    start = np.array(colors[0], dtype=np.float32)
+    end = np.array(colors[1], dtype=np.float32)
+    return (start + (end - start) * ratio[..., None]).astype(np.uint8)
+
 
-def _generate_creative_gradient(width: int, height: int, colors: tuple, style: str = 'diagonal') -> Image.Image:
-    """Create creative gradient backgrounds with different styles."""
-    img = Image.new('RGB', (width, height))
-    draw = ImageDraw.Draw(img)
+if njit is not None:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _radial_kernel(center_x, center_y, max_dist, start, end, out):
+        """Fill `out` with the radial blend row by row, without temporaries."""
+        height, width = out.shape[0], out.shape[1]
+        for y in prange(height):
+            dy2 = (y - center_y) ** 2
+            for x in range(width):
+                ratio = min(math.sqrt((x - center_x) ** 2 + dy2) / max_dist, 1.0)
+                for c in range(3):
+                    out[y, x, c] = np.uint8(start[c] + (end[c] - start[c]) * ratio)
+else:
+    _radial_kernel = None
+
+
+def _generate_creative_gradient(width: int, height: int, colors: tuple, style: str = 'diagonal') -> np.ndarray:
+    """Create creative gradient backgrounds with different styles, as an RGB array."""
+    xs = np.arange(width, dtype=np.float32)
+    ys = np.arange(height, dtype=np.float32)[:, None]
     
     if style == 'diagonal':
         # Diagonal gradient
-        for y in range(height):
-            for x in range(width):
-                ratio = (x + y) / (width + height)
-                r = int(colors[0][0] * (1 - ratio) + colors[1][0] * ratio)
-                g = int(colors[0][1] * (1 - ratio) + colors[1][1] * ratio)
-                b = int(colors[0][2] * (1 - ratio) + colors[1][2] * ratio)
-                draw.point((x, y), fill=(r, g, b))
+        ratio = (xs + ys) / (width + height)
     elif style == 'radial':
         # Radial gradient from center
         center_x, center_y = width // 2, height // 2
         max_dist = math.sqrt(center_x**2 + center_y**2)
-        for y in range(height):
-            for x in range(width):
-                dist = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-                ratio = min(dist / max_dist, 1.0)
-                r = int(colors[0][0] * (1 - ratio) + colors[1][0] * ratio)
-                g = int(colors[0][1] * (1 - ratio) + colors[1][1] * ratio)
-                b = int(colors[0][2] * (1 - ratio) + colors[1][2] * ratio)
-                draw.point((x, y), fill=(r, g, b))
+        if _radial_kernel is not None:
+            out = np.empty((height, width, 3), dtype=np.uint8)
+            _radial_kernel(center_x, center_y, max_dist,
+                           np.array(colors[0], dtype=np.float32),
+                           np.array(colors[1], dtype=np.float32), out)
+            return out
+        ratio = np.minimum(np.sqrt((xs - center_x)**2 + (ys - center_y)**2) / max_dist, 1.0)
     else:
-        # Linear gradient
-        for y in range(height):
-            ratio = y / height
-            r = int(colors[0][0] * (1 - ratio) + colors[1][0] * ratio)
-            g = int(colors[0][1] * (1 - ratio) + colors[1][1] * ratio)
-            b = int(colors[0][2] * (1 - ratio) + colors[1][2] * ratio)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-    
-    return img
-
-
-def _add_creative_shapes(img: Image.Image, audience: str) -> Image.Image:
-    """Add creative shapes and patterns like Canva/Pinterest style."""
-    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    
-    width, height = img.size
-    
-    # Add geometric shapes
-    if audience == 'customers':
-        # Circles and curves for customers
-        for _ in range(8):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            radius = random.randint(50, 150)
-            alpha = random.randint(5, 15)
-            draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
-                        fill=(255, 255, 255, alpha), outline=None)
-    elif audience == 'investors':
-        # Rectangles and lines for investors
-        for _ in range(6):
-            x1 = random.randint(0, width)
-            y1 = random.randint(0, height)
-            x2 = x1 + random.randint(100, 300)
-            y2 = y1 + random.randint(100, 300)
-            alpha = random.randint(8, 18)
-            draw.rectangle([x1, y1, x2, y2], 
-                           fill=(255, 255, 255, alpha), outline=None)
-    else:  # partners
-        # Triangles and polygons for partners
-        for _ in range(5):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            size = random.randint(80, 200)
-            points = [
-                (x, y - size),
-                (x - size, y + size),
-                (x + size, y + size)
-            ]
-            alpha = random.randint(10, 20)
-            draw.polygon(points, fill=(255, 255, 255, alpha), outline=None)
-    
-    return Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
-
-
-def _add_pattern_overlay(img: Image.Image, pattern_type: str = 'dots') -> Image.Image:
-    """Add creative pattern overlays."""
-    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+        # Linear gradient: blend one color per row, repeat it across the width
+        rows = _blend_colors(ys / height, colors)
+        return np.ascontiguousarray(np.broadcast_to(rows, (height, width, 3)))
+    
+    return _blend_colors(ratio, colors)
+
+
+def _draw_circles(draw: ImageDraw.ImageDraw, width: int, height: int, rng: np.random.Generator) -> None:
+    """Circles and curves for customers."""
+    count = 8
+    xs = rng.integers(0, width, count, endpoint=True).tolist()
+    ys = rng.integers(0, height, count, endpoint=True).tolist()
+    radii = rng.integers(50, 150, count, endpoint=True).tolist()
+    alphas = rng.integers(5, 15, count, endpoint=True).tolist()
+    for x, y, radius, alpha in zip(xs, ys, radii, alphas):
+        draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
+                    fill=alpha, outline=None)
+
+
+def _draw_rects(draw: ImageDraw.ImageDraw, width: int, height: int, rng: np.random.Generator) -> None:
+    """Rectangles and lines for investors."""
+    count = 6
+    x1s = rng.integers(0, width, count, endpoint=True).tolist()
+    y1s = rng.integers(0, height, count, endpoint=True).tolist()
+    x_spans = rng.integers(100, 300, count, endpoint=True).tolist()
+    y_spans = rng.integers(100, 300, count, endpoint=True).tolist()
+    alphas = rng.integers(8, 18, count, endpoint=True).tolist()
+    for x1, y1, x_span, y_span, alpha in zip(x1s, y1s, x_spans, y_spans, alphas):
+        draw.rectangle([x1, y1, x1 + x_span, y1 + y_span], 
+                       fill=alpha, outline=None)
+
+
+def _draw_polys(draw: ImageDraw.ImageDraw, width: int, height: int, rng: np.random.Generator) -> None:
+    """Triangles and polygons for partners."""
+    count = 5
+    xs = rng.integers(0, width, count, endpoint=True).tolist()
+    ys = rng.integers(0, height, count, endpoint=True).tolist()
+    sizes = rng.integers(80, 200, count, endpoint=True).tolist()
+    alphas = rng.integers(10, 20, count, endpoint=True).tolist()
+    for x, y, size, alpha in zip(xs, ys, sizes, alphas):
+        points = [
+            (x, y - size),
+            (x - size, y + size),
+            (x + size, y + size)
+        ]
+        draw.polygon(points, fill=alpha, outline=None)
+
+
+@lru_cache(maxsize=8)
+def _gradient_template(width: int, height: int, colors: tuple, style: str) -> np.ndarray:
+    """
+    The gradient for a size/scheme/style, computed once per process and
+    kept read-only; renders draw on a copy.
+    """
+    gradient = _generate_creative_gradient(width, height, colors, style=style)
+    gradient.setflags(write=False)
+    return gradient
+
+
+def _add_creative_shapes(pixels: np.ndarray, draw_shapes: Callable, rng: np.random.Generator) -> None:
+    """Add creative shapes like Canva/Pinterest style, in place on an RGB array."""
+    height, width = pixels.shape[:2]
+    
+    # Shapes are all white, so only their alpha is drawn: an 'L' mask stands
+    # in for a full RGBA overlay.
+    overlay = Image.new('L', (width, height), 0)
+    
+    # Add geometric shapes; all random parameters are drawn up front in
+    # batches, then the draw calls just walk the arrays.
+    draw_shapes(ImageDraw.Draw(overlay), width, height, rng)
+    
+    alpha = np.asarray(overlay)
+    covered = alpha > 0
+    pixels[covered] = _blend_white(pixels[covered], alpha[covered])
+
+
+def _dot_stamp(radius: int) -> tuple:
+    """Return the (dy, dx) pixel offsets PIL fills for a dot of the given radius."""
+    size = 2 * radius + 1
+    stamp = Image.new('L', (size, size), 0)
+    ImageDraw.Draw(stamp).ellipse([0, 0, size - 1, size - 1], fill=255)
+    dy, dx = np.nonzero(np.asarray(stamp))
+    return dy - radius, dx - radius
+
+
+# Dot shapes rasterized once at import, keyed by radius
+_DOT_STAMPS = {radius: _dot_stamp(radius) for radius in range(2, 6)}
+
+
+def _blend_white(pixels: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """
+    Composite white at `alpha` (0-255) over opaque RGB `pixels`.
+    Uses the same fixed-point math as Image.alpha_composite, so the result
+    matches compositing a white RGBA overlay exactly.
+    """
+    alpha = np.asarray(alpha, dtype=np.uint32)[..., None]
+    tmp = (255 * alpha + pixels.astype(np.uint32) * (255 - alpha)) * 128 + (0x80 << 7)
+    return ((((tmp >> 8) + tmp) >> 8) >> 7).astype(np.uint8)
+
+
+def _stamp_dots(pixels: np.ndarray, rng: np.random.Generator) -> None:
+    """Blend the dot grid into an RGB pixel array in place, using the prebuilt stamps."""
+    height, width = pixels.shape[:2]
+    xs, ys = np.meshgrid(np.arange(0, width, 60), np.arange(0, height, 60), indexing='ij')
+    xs, ys = xs.ravel(), ys.ravel()
+    sizes = rng.integers(2, 5, xs.size, endpoint=True)
+    alphas = rng.integers(10, 25, xs.size, endpoint=True)
+    
+    for radius, (dy, dx) in _DOT_STAMPS.items():
+        chosen = sizes == radius
+        dot_y = ys[chosen, None] + dy
+        dot_x = xs[chosen, None] + dx
+        inside = (dot_y >= 0) & (dot_y < height) & (dot_x >= 0) & (dot_x < width)
+        
+        dot_y, dot_x = dot_y[inside], dot_x[inside]
+        dot_alpha = np.broadcast_to(alphas[chosen, None], inside.shape)[inside]
+        pixels[dot_y, dot_x] = _blend_white(pixels[dot_y, dot_x], dot_alpha)
+
+
+def _stamp_waves(pixels: np.ndarray) -> None:
+    """Blend the wave lines into an RGB pixel array in place."""
+    height, width = pixels.shape[:2]
+    xs = np.arange(width)
+    # One sine offset per column, shared by every wave row
+    wave_y = np.arange(0, height, 40)[:, None] + (10 * np.sin(xs / 20)).astype(np.int64)
+    wave_x = np.broadcast_to(xs, wave_y.shape)
+    inside = (wave_y >= 0) & (wave_y < height)
     
+    wave_y, wave_x = wave_y[inside], wave_x[inside]
+    pixels[wave_y, wave_x] = _blend_white(pixels[wave_y, wave_x], 15)
+
+
+def _stamp_grid(pixels: np.ndarray) -> None:
+    """Blend the 1px grid lines into an RGB pixel array in place."""
+    lines = np.zeros(pixels.shape[:2], dtype=bool)
+    lines[:, ::80] = True
+    lines[::80, :] = True
+    pixels[lines] = _blend_white(pixels[lines], 12)
+
+
+def _add_pattern_overlay(pixels: np.ndarray, rng: np.random.Generator, pattern_type: str = 'dots') -> None:
+    """
+    Add creative pattern overlays, in place on an RGB array. Patterns are
+    blended straight into the pixels they cover; no RGBA overlay is built.
+    """
     if pattern_type == 'dots':
-        # Creative dot pattern
-        for x in range(0, img.width, 60):
-            for y in range(0, img.height, 60):
-                size = random.randint(2, 5)
-                alpha = random.randint(10, 25)
-                draw.ellipse([x-size, y-size, x+size, y+size], fill=(255, 255, 255, alpha))
+        _stamp_dots(pixels, rng)
     elif pattern_type == 'waves':
-        # Wave pattern
-        for y in range(0, img.height, 40):
-            for x in range(0, img.width, 1):
-                wave_y = y + int(10 * math.sin(x / 20))
-                if 0 <= wave_y < img.height:
-                    draw.point((x, wave_y), fill=(255, 255, 255, 15))
+        _stamp_waves(pixels)
     elif pattern_type == 'grid':
-        # Grid pattern
-        for x in range(0, img.width, 80):
-            draw.line([(x, 0), (x, img.height)], fill=(255, 255, 255, 12), width=1)
-        for y in range(0, img.height, 80):
-            draw.line([(0, y), (img.width, y)], fill=(255, 255, 255, 12), width=1)
-    
-    return Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+        _stamp_grid(pixels)
+
+
+def _enhance(pixels: np.ndarray, saturation: float, brightness: float) -> None:
+    """Scale saturation around the luma, then brightness, writing back in place."""
+    rgb = pixels.astype(np.float32)
+    luma = (rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32))[..., None]
+    # (luma + s * (rgb - luma)) * b, folded so each step reuses the temporary
+    rgb -= luma
+    rgb *= saturation
+    rgb += luma
+    rgb *= brightness
+    np.clip(rgb, 0, 255, out=rgb)
+    pixels[...] = rgb
 
 
-def _get_creative_color_scheme(audience: str) -> tuple:
-    """Return creative, vibrant color schemes inspired by Pinterest/Canva."""
-    schemes = {
-        'customers': (
+# Creative, vibrant color schemes inspired by Pinterest/Canva, each with the
+# shapes and pattern drawn on it: audience -> (colors, shape drawer, pattern)
+_AUDIENCE_STYLES = {
+    'customers': (
+        (
             (255, 245, 238),  # Soft peach
             (255, 223, 186),  # Warm coral
         ),
-        'investors': (
+        _draw_circles,
+        'dots',
+    ),
+    'investors': (
+        (
             (240, 248, 255),  # Light blue
             (176, 224, 230),  # Powder blue
         ),
-        'partners': (
+        _draw_rects,
+        'grid',
+    ),
+    'partners': (
+        (
             (245, 255, 250),  # Mint cream
             (152, 251, 152),  # Pale green
         ),
-    }
-    return schemes.get(audience, ((250, 250, 250), (240, 240, 240)))
+        _draw_polys,
+        'waves',
+    ),
+}
+_DEFAULT_STYLE = (((250, 250, 250), (240, 240, 240)), _draw_polys, 'dots')
 
 
-def generate_brochure_background(profile: BusinessProfile, audience: str) -> str:
+def _get_audience_style(audience: str) -> tuple:
+    """Return the (colors, shape drawer, pattern) triple for an audience."""
+    return _AUDIENCE_STYLES.get(audience, _DEFAULT_STYLE)
+
+
+def _background_path(audience: str, style: tuple) -> Path:
     """
-    Generate a creative, visually-rich background image for a brochure.
-    Returns the path to the saved image file.
+    Path of the background for an audience and its style. The name carries
+    a hash of the style, the size and _RENDER_VERSION, so a changed scheme,
+    shape, pattern or size gets a new file instead of reusing a stale one.
+    Changes to the drawing code itself are only picked up by bumping
+    _RENDER_VERSION.
     """
-    # Standard brochure size (A4 ratio, 1200x1697 for web)
-    width, height = 1200, 1697
+    colors, draw_shapes, pattern = style
+    width, height = BACKGROUND_SIZE
+    inputs = (_RENDER_VERSION, audience, colors, draw_shapes.__name__, pattern, width, height)
+    key = hashlib.blake2b(repr(inputs).encode()).hexdigest()[:12]
+    return Path('static/images') / f'brochure_bg_{audience}_{key}.jpg'
+
+
+def _remove_stale_backgrounds(filepath: Path, audience: str) -> None:
+    """Delete superseded renders of an audience's background next to filepath."""
+    prefix = f'brochure_bg_{audience}_'
+    for old in filepath.parent.glob(f'{prefix}*.jpg'):
+        key = old.name[len(prefix):-len('.jpg')]
+        # Only touch this audience's hash-named files, not e.g. "<audience>_x" ones
+        if old != filepath and len(key) == 12 and all(c in '0123456789abcdef' for c in key):
+            old.unlink(missing_ok=True)
+
+
+def _render_background(audience: str, style: tuple) -> str:
+    """Render and save the background for one audience and its style."""
+    filepath = _background_path(audience, style)
+    if filepath.exists():
+        return str(filepath)
+    
+    colors, draw_shapes, pattern = style
+    width, height = BACKGROUND_SIZE
     
-    # Get creative color scheme
-    colors = _get_creative_color_scheme(audience)
+    # Seed from the audience so the same audience always renders the same
+    # pixels; this is what makes caching the result on disk safe.
+    rng = np.random.default_rng(zlib.crc32(audience.encode()))
     
-    # Generate creative gradient (diagonal for visual interest)
-    img = _generate_creative_gradient(width, height, colors, style='diagonal')
+    # Generate creative gradient (diagonal for visual interest); the shapes
+    # and pattern are then blended into a copy of it, in place.
+    pixels = _gradient_template(width, height, colors, 'diagonal').copy()
     
     # Add creative shapes
-    img = _add_creative_shapes(img, audience)
+    _add_creative_shapes(pixels, draw_shapes, rng)
     
     # Add pattern overlay
-    pattern_types = ['dots', 'waves', 'grid']
-    pattern = random.choice(pattern_types)
-    img = _add_pattern_overlay(img, pattern_type=pattern)
+    _add_pattern_overlay(pixels, rng, pattern_type=pattern)
     
-    # Apply blur for dreamy effect
-    img = img.filter(ImageFilter.GaussianBlur(radius=0.5))
+    # Enhance saturation and brightness for vibrancy in a single pass
+    _enhance(pixels, saturation=1.1, brightness=1.15)
+    img = Image.fromarray(pixels, 'RGB')
     
-    # Enhance brightness and saturation for vibrancy
-    enhancer = ImageEnhance.Brightness(img)
-    img = enhancer.enhance(1.15)  # 15% brighter
+    # Save the image
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temp file unique to this process and thread, then rename it into
+    # place, so concurrent workers never serve a half-written JPEG. Pillow opens
+    # the path itself, so the file gets the usual umask-based permissions.
+    tmp_path = filepath.with_name(f'.{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        # 4:2:0 chroma subsampling is invisible on smooth gradients and halves encode work
+        img.save(tmp_path, 'JPEG', quality=82, subsampling=2, optimize=False, progressive=False)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _remove_stale_backgrounds(filepath, audience)
     
-    enhancer = ImageEnhance.Color(img)
-    img = enhancer.enhance(1.1)  # 10% more saturated
+    return str(filepath)
+
+
+def generate_brochure_background(profile: BusinessProfile, audience: str) -> str:
+    """
+    Generate a creative, visually-rich background image for a brochure.
+    Returns the path to the saved image file.
     
-    # Save the image
-    output_dir = Path('static/images')
-    output_dir.mkdir(parents=True, exist_ok=True)
+    The background only depends on the audience (and its style), so
+    an existing render on disk is reused instead of drawn again.
+    """
+    return _render_background(audience, _get_audience_style(audience))
+
+
+def generate_all_backgrounds(profile: BusinessProfile, audiences: Iterable[str],
+                             use_processes: bool = False) -> Dict[str, str]:
+    """
+    Generate the backgrounds for several audiences in parallel, one worker
+    per audience. Backgrounds already on disk are returned without starting
+    a worker. Returns a mapping of audience to image path.
     
-    filename = f'brochure_bg_{audience}.jpg'
-    filepath = output_dir / filename
-    img.save(filepath, 'JPEG', quality=90)
+    Workers are threads by default, which is safe to call at import time.
+    use_processes=True runs them in a process pool instead; only do that
+    from under an `if __name__ == '__main__':` guard, since with the spawn
+    start method (Windows, macOS) every worker re-imports the main module.
+    """
+    audiences = list(audiences)
+    paths = {}
+    missing = []
+    for audience in audiences:
+        filepath = _background_path(audience, _get_audience_style(audience))
+        if filepath.exists():
+            paths[audience] = str(filepath)
+        else:
+            missing.append(audience)
     
-    return str(filepath)
+    if not missing:
+        return paths
+    
+    # Renders share no state; seeding is per audience, so the results match
+    # a serial run. NumPy and Pillow release the GIL for the heavy parts.
+    workers = min(len(missing), os.cpu_count() or 1)
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        rendered = executor.map(partial(generate_brochure_background, profile), missing)
+        paths.update(zip(missing, rendered))
+    
+    return {audience: paths[audience] for audience in audiences}
 
 
 if __name__ == '__main__':
@@ -198,6 +403,7 @@ if __name__ == '__main__':
         "brand_tone_signals": ["Professional"],
     }
     
-    for audience in ['customers', 'investors', 'partners']:
-        path = generate_brochure_background(test_profile, audience)
+    paths = generate_all_backgrounds(test_profile, ['customers', 'investors', 'partners'],
+                                     use_processes=True)
+    for path in paths.values():
         print(f"Generated: {path}")
@@ -7,94 +7,176 @@ Responsible for:
 - Returning a simple list of content blocks: headings + associated text.
 """
 
+import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Union
 
-from bs4 import BeautifulSoup, Tag
+import lxml.html
+from lxml import etree
 
 
 ContentBlock = Dict[str, Any]
 
+# HTML is fed to the parser in chunks of this many bytes
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Script/style tags, plus common structural wrappers that are rarely core content
+_NOISE_TAGS = frozenset({"script", "style", "noscript", "nav", "footer", "form", "aside"})
+
+# id/class substrings that mark layout noise rather than content
+_NOISE_KEYWORDS = (
+    "cookie",
+    "banner",
+    "consent",
+    "gdpr",
+    "newsletter",
+    "signup",
+    "subscribe",
+    "modal",
+    "popup",
+    "promo",
+    "advert",
+    "ads",
+    "legal",
+    "terms",
+    "privacy",
+)
+
+# One alternation, so each tag's id/class string is scanned once
+_NOISE_RE = re.compile("|".join(_NOISE_KEYWORDS))
+
+_HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+# Every candidate block node, returned in document order
+_BLOCKS_XPATH = etree.XPath(".//h1|.//h2|.//h3|.//h4|.//h5|.//h6|.//p|.//li")
+
+# Clear boilerplate phrases (copyright lines, legal links)
+_BOILERPLATE_PHRASES = (
+    "all rights reserved",
+    "terms of use",
+    "privacy policy",
+    "cookie policy",
+)
+
+
+def load_html(source: Union[str, BinaryIO]) -> lxml.html.HtmlElement:
+    """
+    Read HTML from a path or an open binary stream (e.g. an upload)
+    and return the parsed lxml document, with obvious noise removed.
+    """
+    if hasattr(source, "read"):
+        return _parse_without_noise(source)
 
-def load_html(path: str) -> BeautifulSoup:
-    """Read HTML from disk and return a BeautifulSoup object."""
-    html_path = Path(path)
+    html_path = Path(source)
     if not html_path.is_file():
         raise FileNotFoundError(f"HTML file not found: {html_path}")
+    with html_path.open("rb") as stream:
+        return _parse_without_noise(stream)
 
-    text = html_path.read_text(encoding="utf-8", errors="ignore")
-    # lxml parser is usually faster and more forgiving than html.parser
-    return BeautifulSoup(text, "lxml")
 
+def _is_noise(element: lxml.html.HtmlElement) -> bool:
+    """Script/style tags, layout wrappers, and id/class patterns like banners."""
+    if element.tag in _NOISE_TAGS:
+        return True
+
+    element_id, classes = element.get("id"), element.get("class")
+    if not (element_id or classes):
+        # Most elements have neither; skip building and lowercasing a string
+        return False
+    # One lower() over the raw attribute values, not one per class name
+    combined = f"{element_id or ''} {classes or ''}".lower()
+    return _NOISE_RE.search(combined) is not None
 
-def _remove_obvious_noise(soup: BeautifulSoup) -> None:
+
+def _parse_without_noise(stream: BinaryIO) -> lxml.html.HtmlElement:
     """
-    Strip script/style tags and obvious layout noise.
-    We do this in-place to keep the rest of the code straightforward.
+    Parse the stream chunk by chunk, emptying each noise element as soon
+    as it is closed, so neither the raw file nor noise subtrees (scripts,
+    menus, inline SVG icons) have to be held in full.
     """
-    # Kill script/style outright
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-
-    # Common structural wrappers that are rarely core content
-    for tag_name in ["nav", "footer", "form", "aside"]:
-        for tag in soup.find_all(tag_name):
-            tag.decompose()
-
-    # Heuristic removal based on id/class patterns
-    noise_keywords = [
-        "cookie",
-        "banner",
-        "consent",
-        "gdpr",
-        "newsletter",
-        "signup",
-        "subscribe",
-        "modal",
-        "popup",
-        "promo",
-        "advert",
-        "ads",
-        "legal",
-        "terms",
-        "privacy",
-    ]
-
-    for tag in soup.find_all(True):  # all tags
-        id_str = (tag.get("id") or "").lower()
-        class_str = " ".join(c.lower() for c in tag.get("class", []))
-        combined = f"{id_str} {class_str}"
-
-        if any(keyword in combined for keyword in noise_keywords):
-            # If this wrapper is clearly decoration, drop it entirely
-            tag.decompose()
-
-
-def _pick_main_container(soup: BeautifulSoup) -> Tag:
+    # Input is read as UTF-8 whatever the page declares; bad bytes become U+FFFD
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding="utf-8")
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+
+    outer_noise = None  # outermost noise element still open, if any
+    emptied: List[lxml.html.HtmlElement] = []
+
+    def handle_events() -> None:
+        nonlocal outer_noise
+        for event, element in parser.read_events():
+            if event == "start":
+                if outer_noise is None and _is_noise(element):
+                    outer_noise = element
+            elif element is outer_noise:
+                # Fully parsed, so it is safe to free its content now; the
+                # text after it is not parsed yet and must stay put
+                element.clear(keep_tail=True)
+                emptied.append(element)
+                outer_noise = None
+
+    while chunk := stream.read(_READ_CHUNK_SIZE):
+        if not isinstance(chunk, bytes):
+            raise TypeError(
+                f"HTML stream must be opened in binary mode, got {type(chunk).__name__}"
+            )
+        parser.feed(chunk)
+        handle_events()
+
+    try:
+        doc = parser.close()
+    except etree.XMLSyntaxError:
+        doc = None
+    handle_events()
+
+    if doc is None:
+        # Empty (or comment-only) input: treat it as a blank page
+        return lxml.html.document_fromstring("<html><body></body></html>")
+
+    # Parsing is done, so the emptied elements can now be unlinked
+    for element in emptied:
+        _drop(element)
+    return doc
+
+
+def _drop(element: lxml.html.HtmlElement) -> None:
     """
-    Try to select the main content container.
-    Prefer <main>, then a large <div>, otherwise fall back to <body>.
+    Remove an element and everything inside it. Unlike lxml's drop_tree,
+    the text after it stays a separate run (held by an empty comment),
+    so it is not glued onto the text before it.
     """
-    main = soup.find("main")
-    if main:
-        return main
+    parent = element.getparent()
+    if parent is None:
+        # The <html> root itself: nothing to detach it from, just empty it
+        element.clear()
+        return
 
-    body = soup.body
-    if not body:
-        # Degenerate pages: just use the top-level soup
-        return soup
+    marker = etree.Comment()
+    marker.tail = element.tail
+    parent.replace(element, marker)
 
-    # Naive heuristic: the largest div by text length inside body
-    candidate = body
-    max_len = len(body.get_text(strip=True))
 
-    for div in body.find_all("div"):
-        text_len = len(div.get_text(strip=True))
-        if text_len > max_len:
-            max_len = text_len
-            candidate = div
+def _text_runs(element: lxml.html.HtmlElement) -> List[str]:
+    """Return the element's non-empty text runs, whitespace-trimmed."""
+    return [run for run in (text.strip() for text in element.itertext()) if run]
 
-    return candidate
+
+def _pick_main_container(doc: lxml.html.HtmlElement) -> lxml.html.HtmlElement:
+    """
+    Try to select the main content container.
+    Prefer <main>, otherwise fall back to <body>.
+    """
+    main = doc.find(".//main")
+    if main is not None:
+        return main
+
+    body = doc.find("body")
+    if body is None:
+        # Degenerate pages: just use the whole document
+        return doc
+
+    # A "largest div" can never beat body here: body's text includes every
+    # div's text, so the old length comparison always kept body.
+    return body
 
 
 def _is_meaningful_text(text: str) -> bool:
@@ -107,18 +189,12 @@ def _is_meaningful_text(text: str) -> bool:
         return False
     # Skip clear boilerplate phrases
     lower = stripped.lower()
-    boilerplate_phrases = [
-        "all rights reserved",
-        "terms of use",
-        "privacy policy",
-        "cookie policy",
-    ]
-    if any(phrase in lower for phrase in boilerplate_phrases):
+    if any(phrase in lower for phrase in _BOILERPLATE_PHRASES):
         return False
     return True
 
 
-def extract_content_blocks(soup: BeautifulSoup) -> List[ContentBlock]:
+def extract_content_blocks(doc: lxml.html.HtmlElement) -> List[ContentBlock]:
     """
     Return a flat list of content blocks with a very simple structure:
     - type: "heading" or "paragraph"
@@ -127,51 +203,44 @@ def extract_content_blocks(soup: BeautifulSoup) -> List[ContentBlock]:
 
     We walk the main container in document order so the analyzer
     can infer structure without us doing heavy DOM reasoning.
+    The document is expected to come from load_html, noise already removed.
     """
-    _remove_obvious_noise(soup)
-    root = _pick_main_container(soup)
+    root = _pick_main_container(doc)
 
     blocks: List[ContentBlock] = []
 
-    for element in root.descendants:
-        if not isinstance(element, Tag):
+    for element in _BLOCKS_XPATH(root):
+        text = " ".join(_text_runs(element))
+        if not _is_meaningful_text(text):
             continue
 
         # Headings
-        if element.name in {f"h{i}" for i in range(1, 7)}:
-            text = element.get_text(separator=" ", strip=True)
-            if not _is_meaningful_text(text):
-                continue
-            level = int(element.name[1])
+        if element.tag in _HEADING_TAGS:
             blocks.append(
                 {
                     "type": "heading",
-                    "level": level,
+                    "level": int(element.tag[1]),
                     "text": text,
                 }
             )
             continue
 
         # Paragraph-like nodes
-        if element.name in {"p", "li"}:
-            text = element.get_text(separator=" ", strip=True)
-            if not _is_meaningful_text(text):
-                continue
-            blocks.append(
-                {
-                    "type": "paragraph",
-                    "level": None,
-                    "text": text,
-                }
-            )
+        blocks.append(
+            {
+                "type": "paragraph",
+                "level": None,
+                "text": text,
+            }
+        )
 
     return blocks
 
 
-def scrape_html(path: str) -> List[ContentBlock]:
-    """Public entry point: from HTML path to cleaned content blocks."""
-    soup = load_html(path)
-    return extract_content_blocks(soup)
+def scrape_html(source: Union[str, BinaryIO]) -> List[ContentBlock]:
+    """Public entry point: from HTML path or stream to cleaned content blocks."""
+    doc = load_html(source)
+    return extract_content_blocks(doc)
 
 
 if __name__ == "__main__":
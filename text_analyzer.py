@@ -31,7 +31,6 @@ def analyze_text(text: str) -> List[ContentBlock]:
         return blocks
     
     lines = text.strip().split('\n')
-    current_heading = None
     
     for line in lines:
         line = line.strip()
@@ -41,8 +40,9 @@ def analyze_text(text: str) -> List[ContentBlock]:
         # Detect headings (lines that are short and end without punctuation, or start with #)
         if line.startswith('#'):
             # Markdown-style heading
-            level = len(line) - len(line.lstrip('#'))
-            heading_text = line.lstrip('#').strip()
+            heading_text = line.lstrip('#')
+            level = len(line) - len(heading_text)
+            heading_text = heading_text.strip()
             if heading_text:
                 blocks.append({
                     "type": "heading",